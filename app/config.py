@@ -11,11 +11,13 @@ PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 EMBEDDINGS_DIR = PROJECT_ROOT / "embeddings"
 VECTOR_STORE_DIR = PROJECT_ROOT / "Vector_Store"
+EMBEDDING_JOBS_DIR = EMBEDDINGS_DIR / "jobs"
 
 # Create directories if they don't exist
 DATA_DIR.mkdir(exist_ok=True)
 EMBEDDINGS_DIR.mkdir(exist_ok=True)
 VECTOR_STORE_DIR.mkdir(exist_ok=True)
+EMBEDDING_JOBS_DIR.mkdir(exist_ok=True)
 
 # Supported HuggingFace embedding models
 SUPPORTED_EMBEDDING_MODELS = [
@@ -1,118 +1,700 @@
 """
 Embedding and Vector Store Utilities for Semantic Search Engine.
 Contains helper functions for document processing, embedding generation, and vector store management.
+
+Vector stores, embedding models, the text splitter and faiss are imported lazily
+on first use, so importing this module (and starting the API) stays cheap.
 """
+from __future__ import annotations
+
 import os
-import json
+import sys
+import math
+import mmap
 import time
+import uuid
+import queue
+import pickle
+import shutil
+import hashlib
+import tempfile
+import functools
+import itertools
+import threading
+import contextlib
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import TYPE_CHECKING, List, Dict, Tuple, Optional, Set, Literal, Iterable, Iterator
+
+import numpy as np
+import orjson
 
 # Use simple imports that work across versions
 try:
-    from langchain_community.embeddings import HuggingFaceEmbeddings
+    from langchain_core.documents import Document
 except ImportError:
-    from langchain.embeddings import HuggingFaceEmbeddings
+    from langchain.schema import Document
 
-try:
+if TYPE_CHECKING:
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+    from langchain_community.vectorstores import FAISS
+    from langchain_community.vectorstores.utils import DistanceStrategy
     from langchain_text_splitters import RecursiveCharacterTextSplitter
-except ImportError:
-    from langchain.text_splitter import RecursiveCharacterTextSplitter
 
-try:
-    from langchain_core.documents import Document
-except ImportError:
-    from langchain.schema import Document
+from app.config import DATA_DIR, EMBEDDINGS_DIR, VECTOR_STORE_DIR, SUPPORTED_EMBEDDING_MODELS
 
-# Import vector stores
-try:
-    from langchain_community.vectorstores import FAISS, Chroma
-except ImportError:
-    from langchain.vectorstores import FAISS, Chroma
+# Serializes first-time model loads so concurrent requests don't load the same model twice
+_model_lock = threading.Lock()
+
+# Loaded vector stores keyed by (vector_db, model_name), with the store version they were loaded at
+_vector_store_cache: Dict[Tuple[str, str], Tuple[int, object]] = {}
+_vector_store_lock = threading.Lock()
+
+# Torch thread pools can only be sized once per process
+_torch_threads_configured = False
+
+# Chunks are consumed and embedded in batches of this size while building a vector store
+EMBED_BATCH_SIZE = 1024
+
+# Files read in parallel, and at most held in memory, ahead of the chunking pipeline
+DOCUMENT_READ_THREADS = 16
+
+# Number of chunk batches prepared ahead of the embedder by the background producer
+PREFETCH_BATCHES = 4
+
+# Above this many chunks, embedding is sharded across worker processes
+PARALLEL_EMBED_MIN_TEXTS = 10_000
+TORCH_INTEROP_THREADS = 2
+
+# Interval between attempts when waiting for a FileLock held elsewhere
+LOCK_POLL_SECONDS = 0.1
+
+# Chroma rejects oversized add() calls, so precomputed vectors are inserted in batches
+CHROMA_ADD_BATCH_SIZE = 5000
+
+# Above this many chunks FAISS uses an HNSW graph instead of an exhaustive flat scan
+HNSW_MIN_CHUNKS = 10_000
+HNSW_EF_CONSTRUCTION = 200
+DEFAULT_HNSW_M = 32
+DEFAULT_HNSW_EF_SEARCH = 64
+
+# Product quantization is only worth its recall loss on very large corpora
+IVFPQ_MIN_CHUNKS = 50_000
+IVFPQ_M = 16
+IVFPQ_NBITS = 8
+IVFPQ_MAX_NPROBE = 32
+
+# Scalar quantizer used to store vectors for each non-fp32 precision
+PRECISION_QUANTIZER_TYPES = {
+    "fp16": "QT_fp16",
+    "int8": "QT_8bit",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _huggingface_embeddings():
+    try:
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+    except ImportError:
+        from langchain.embeddings import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings
+
+
+@functools.lru_cache(maxsize=None)
+def _text_splitter():
+    try:
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+    except ImportError:
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+    return RecursiveCharacterTextSplitter
+
+
+@functools.lru_cache(maxsize=None)
+def _faiss():
+    try:
+        from langchain_community.vectorstores import FAISS
+    except ImportError:
+        from langchain.vectorstores import FAISS
+    return FAISS
+
+
+@functools.lru_cache(maxsize=None)
+def _chroma():
+    try:
+        from langchain_community.vectorstores import Chroma
+    except ImportError:
+        from langchain.vectorstores import Chroma
+    return Chroma
+
+
+@functools.lru_cache(maxsize=None)
+def _in_memory_docstore():
+    try:
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+    except ImportError:
+        from langchain.docstore.in_memory import InMemoryDocstore
+    return InMemoryDocstore
+
+
+@functools.lru_cache(maxsize=None)
+def _distance_strategy():
+    try:
+        from langchain_community.vectorstores.utils import DistanceStrategy
+    except ImportError:
+        from langchain.vectorstores.utils import DistanceStrategy
+    return DistanceStrategy
+
+
+def _try_lock_fd(fd: int) -> bool:
+    """Try to take an exclusive OS lock on an open file without waiting."""
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+class FileLock:
+    """
+    Exclusive lock shared across processes, backed by an OS lock on a lock file.
+
+    The OS drops the lock when the holding process exits, so a crashed build
+    never leaves it held. Separate FileLock objects for the same path also
+    exclude each other within one process.
+    """
+
+    def __init__(self, lock_path: Path):
+        self.lock_path = lock_path
+        self._fd: Optional[int] = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Take the lock.
+
+        Args:
+            blocking: Wait until the lock is free instead of giving up when it is held
+
+        Returns:
+            Whether the lock was acquired (always True when blocking)
+        """
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT)
+        try:
+            while not _try_lock_fd(fd):
+                if not blocking:
+                    os.close(fd)
+                    return False
+                time.sleep(LOCK_POLL_SECONDS)
+        except BaseException:
+            os.close(fd)
+            raise
+
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        """Release the lock if held."""
+        if self._fd is None:
+            return
+
+        if sys.platform == "win32":
+            import msvcrt
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        # Closing the descriptor releases a flock
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def __del__(self):
+        # A holder dropped without releasing (e.g. a background task that never ran) must not keep the lock
+        self.release()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache of chunk embeddings for a single embedding model.
+
+    Vectors are keyed by a blake2b digest of the chunk text and persisted to
+    EMBEDDINGS_DIR as one .npz file per model, so unchanged chunks are not
+    re-embedded when a vector store is rebuilt. Each build covers the whole
+    data directory, so entries not used by a build belong to deleted or
+    edited chunks and are dropped when the cache is saved.
+
+    The FAISS and Chroma stores of one model share its cache, so saves are
+    serialized through a per-model FileLock and keep entries saved by
+    another build since this cache was loaded.
+    """
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        short_name = get_model_short_name(model_name)
+        self.path = EMBEDDINGS_DIR / f"{short_name}_cache.npz"
+        self.lock = FileLock(EMBEDDINGS_DIR / f"{short_name}_cache.lock")
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._used: Set[str] = set()
+        self._dirty = False
+
+        with self.lock:
+            self._loaded_version = self._file_version()
+            self._vectors = self._read()
+
+    def _file_version(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the cache file, or None if it doesn't exist."""
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read(self) -> Dict[str, np.ndarray]:
+        """Read the persisted cache file into a dict of vectors by key."""
+        if not self.path.exists():
+            return {}
+
+        try:
+            with np.load(self.path) as data:
+                return dict(zip(data["keys"].tolist(), data["vectors"]))
+        except Exception as e:
+            print(f"Error loading embedding cache {self.path.name}: {str(e)}")
+            return {}
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """Return the cache key for a chunk of text."""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    def find_uncached_texts(self, texts: List[str]) -> List[int]:
+        """
+        Find which texts have no cached embedding yet.
+
+        Args:
+            texts: Chunk texts to look up
+
+        Returns:
+            Indices into texts of the cache misses
+        """
+        return [i for i, text in enumerate(texts) if self.hash_text(text) not in self._vectors]
+
+    def update(self, texts: List[str], vectors) -> None:
+        """Store freshly computed vectors for the given texts."""
+        for text, vector in zip(texts, vectors):
+            self._vectors[self.hash_text(text)] = np.asarray(vector, dtype=np.float32)
+        self._dirty = True
+
+    def lookup(self, texts: List[str]) -> np.ndarray:
+        """Return the cached vectors for texts as a (len(texts), dim) float32 matrix."""
+        keys = [self.hash_text(text) for text in texts]
+        self._used.update(keys)
+        return np.stack([self._vectors[key] for key in keys])
+
+    def save(self) -> None:
+        """
+        Persist the cache to disk, keeping the entries looked up since it was
+        loaded and any entries another build saved in the meantime.
+        """
+        with self.lock:
+            # The file changed since it was loaded, so another build of this model saved
+            # its entries; keep them alongside ours instead of evicting them
+            version = self._file_version()
+            if version != self._loaded_version:
+                saved_vectors = self._read()
+                self._used.update(saved_vectors)
+                self._vectors = {**saved_vectors, **self._vectors}
+                self._dirty = True
+
+            stale = self._vectors.keys() - self._used
+            if stale:
+                for key in stale:
+                    del self._vectors[key]
+                self._dirty = True
+
+            if not self._dirty or not self._vectors:
+                return
+
+            keys = np.array(list(self._vectors.keys()))
+            vectors = np.stack(list(self._vectors.values()))
+
+            # Write to a uniquely named temp file first so a crash never leaves a truncated cache behind
+            with tempfile.NamedTemporaryFile(dir=EMBEDDINGS_DIR, suffix='.tmp', delete=False) as f:
+                try:
+                    np.savez(f, keys=keys, vectors=vectors)
+                except BaseException:
+                    f.close()
+                    os.remove(f.name)
+                    raise
+            os.replace(f.name, self.path)
+
+            self._loaded_version = self._file_version()
+            self._dirty = False
+
+
+def embed_texts_cached(
+    texts: List[str],
+    embeddings: HuggingFaceEmbeddings,
+    cache: EmbeddingCache,
+    executor: Optional[ProcessPoolExecutor] = None
+) -> np.ndarray:
+    """
+    Embed texts, only running the model on distinct texts missing from the embedding cache.
+
+    New vectors are added to the cache; the caller is responsible for saving it.
+
+    Args:
+        texts: Chunk texts to embed
+        embeddings: HuggingFace embeddings object
+        cache: Embedding cache for the model behind embeddings
+        executor: Optional embedding pool (see create_embedding_pool) to shard misses across
+
+    Returns:
+        (len(texts), dim) float32 matrix of embeddings in the same order as texts
+    """
+    missing = cache.find_uncached_texts(texts)
+    if missing:
+        # Embed each distinct text once; duplicates share its vector through the cache lookup
+        missing_texts = list(dict.fromkeys(texts[i] for i in missing))
+        if executor is not None:
+            new_vectors = embed_texts_parallel(missing_texts, cache.model_name, executor)
+        else:
+            new_vectors = embeddings.embed_documents(missing_texts)
+        cache.update(missing_texts, new_vectors)
 
-from app.config import DATA_DIR, VECTOR_STORE_DIR
+    return cache.lookup(texts)
 
 
-def load_documents_from_data_dir() -> Tuple[List[Document], int]:
+def read_document(file_path: Path) -> Optional[Document]:
     """
-    Load all .txt and .md files from the data directory.
+    Read a single text file into a Document.
+
+    Args:
+        file_path: Path of the file to read
 
     Returns:
-        Tuple of (list of Document objects, number of files loaded)
+        Document object, or None if the file could not be read
+    """
+    try:
+        # Read file content
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        # Create Document object with metadata
+        return Document(
+            page_content=content,
+            metadata={
+                "source": file_path.name,
+                "file_path": str(file_path)
+            }
+        )
+    except Exception as e:
+        print(f"Error loading {file_path.name}: {str(e)}")
+        return None
+
+
+def list_document_paths() -> List[Path]:
     """
-    documents = []
-    file_count = 0
+    List the .txt and .md files in the data directory.
 
+    Returns:
+        List of file paths
+    """
     # Supported file extensions
     supported_extensions = ['.txt', '.md']
 
-    # Iterate through all files in data directory
-    for file_path in DATA_DIR.iterdir():
-        if file_path.is_file() and file_path.suffix.lower() in supported_extensions:
-            try:
-                # Read file content
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                # Create Document object with metadata
-                doc = Document(
-                    page_content=content,
-                    metadata={
-                        "source": file_path.name,
-                        "file_path": str(file_path)
-                    }
-                )
-                documents.append(doc)
-                file_count += 1
-            except Exception as e:
-                print(f"Error loading {file_path.name}: {str(e)}")
-                continue
+    with os.scandir(DATA_DIR) as entries:
+        return [
+            Path(entry.path) for entry in entries
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in supported_extensions
+        ]
+
+
+def iter_documents_from_data_dir() -> Iterator[Document]:
+    """
+    Lazily read the .txt and .md files in the data directory.
 
-    return documents, file_count
+    Used as the source of a chunk pipeline. Up to DOCUMENT_READ_THREADS files
+    are read ahead on a thread pool (reads release the GIL, so disk I/O for
+    different files overlaps), and only that many are held in memory ahead
+    of the consumer.
 
+    Yields:
+        Document objects for the files that could be read, in directory order
+    """
+    file_paths = iter(list_document_paths())
+
+    with ThreadPoolExecutor(max_workers=DOCUMENT_READ_THREADS) as executor:
+        pending = deque(
+            executor.submit(read_document, file_path)
+            for file_path in itertools.islice(file_paths, DOCUMENT_READ_THREADS)
+        )
+
+        while pending:
+            doc = pending.popleft().result()
+
+            # Start the next read before handing this document on
+            file_path = next(file_paths, None)
+            if file_path is not None:
+                pending.append(executor.submit(read_document, file_path))
+
+            if doc is not None:
+                yield doc
 
-def chunk_documents(documents: List[Document], chunk_size: int = 500, chunk_overlap: int = 50) -> List[Document]:
+
+@functools.lru_cache(maxsize=16)
+def get_text_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
     """
-    Split documents into chunks using RecursiveCharacterTextSplitter.
+    Get a RecursiveCharacterTextSplitter, reused across calls with the same settings.
 
     Args:
-        documents: List of Document objects to chunk
-        chunk_size: Maximum size of each chunk (default: 500)
-        chunk_overlap: Number of overlapping characters between chunks (default: 50)
+        chunk_size: Maximum size of each chunk
+        chunk_overlap: Number of overlapping characters between chunks
 
     Returns:
-        List of chunked Document objects with preserved metadata
+        RecursiveCharacterTextSplitter object
     """
-    text_splitter = RecursiveCharacterTextSplitter(
+    return _text_splitter()(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
         length_function=len,
         is_separator_regex=False,
     )
 
-    # Split documents while preserving metadata
-    chunks = text_splitter.split_documents(documents)
 
-    return chunks
+def iter_chunks(documents: Iterable[Document], chunk_size: int = 500, chunk_overlap: int = 50) -> Iterator[Document]:
+    """
+    Lazily split documents into chunks using RecursiveCharacterTextSplitter.
 
+    Chunks are produced one at a time and share their source document's
+    metadata dict, so a large corpus never has to exist as a full chunk list.
 
-def create_embeddings(model_name: str) -> HuggingFaceEmbeddings:
+    Args:
+        documents: Document objects to chunk
+        chunk_size: Maximum size of each chunk (default: 500)
+        chunk_overlap: Number of overlapping characters between chunks (default: 50)
+
+    Yields:
+        Chunked Document objects with preserved metadata
     """
-    Create HuggingFace embeddings model.
+    text_splitter = get_text_splitter(chunk_size, chunk_overlap)
+
+    for doc in documents:
+        for piece in text_splitter.split_text(doc.page_content):
+            yield Document(page_content=piece, metadata=doc.metadata)
+
+
+def iter_batches(items: Iterable, batch_size: int) -> Iterator[List]:
+    """Yield successive lists of up to batch_size items from an iterable."""
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, batch_size)):
+        yield batch
+
+
+def prefetch(items: Iterable, maxsize: int = PREFETCH_BATCHES) -> Iterator:
+    """
+    Iterate over items while a background thread produces the next ones.
+
+    The producer runs up to maxsize items ahead, so work done while
+    producing (reading, splitting) overlaps with work done by the consumer
+    (embedding). Exceptions raised by the producer are re-raised in the
+    consumer.
 
     Args:
-        model_name: Name of the HuggingFace model (e.g., "sentence-transformers/all-MiniLM-L6-v2")
+        items: Iterable to consume in the background
+        maxsize: Maximum number of items buffered ahead of the consumer
+
+    Yields:
+        The items of the iterable, in order
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+    done = object()
+
+    def produce():
+        error = None
+        try:
+            for item in items:
+                buffer.put(item)
+                if stopped.is_set():
+                    return
+        except BaseException as e:
+            error = e
+        finally:
+            # Always signal the end, or the consumer would block forever on buffer.get()
+            if not stopped.is_set():
+                buffer.put((done, error))
+
+    threading.Thread(target=produce, daemon=True).start()
+
+    try:
+        while True:
+            item = buffer.get()
+            if isinstance(item, tuple) and len(item) == 2 and item[0] is done:
+                if item[1] is not None:
+                    raise item[1]
+                return
+            yield item
+    finally:
+        # Unblock a producer waiting on a full buffer if the consumer stops early
+        stopped.set()
+        while not buffer.empty():
+            buffer.get_nowait()
+
+
+def server_worker_count() -> int:
+    """
+    Number of uvicorn worker processes sharing the machine's CPUs.
+
+    Taken from WEB_CONCURRENCY (uvicorn's environment variable for --workers,
+    set by `python -m app.main`), else from a --workers option on the uvicorn
+    command line, which worker processes inherit in sys.argv.
+    """
+    if os.environ.get("WEB_CONCURRENCY", "").isdigit():
+        return max(1, int(os.environ["WEB_CONCURRENCY"]))
+
+    for i, arg in enumerate(sys.argv):
+        if arg.startswith("--workers="):
+            value = arg.partition("=")[2]
+        elif arg == "--workers" and i + 1 < len(sys.argv):
+            value = sys.argv[i + 1]
+        else:
+            continue
+
+        if value.isdigit():
+            return max(1, int(value))
+
+    return 1
+
+
+def worker_thread_count() -> int:
+    """Compute threads available to this process, with the logical CPUs split evenly between the server workers."""
+    return max(1, (os.cpu_count() or 1) // server_worker_count())
+
+
+def configure_worker_threads() -> None:
+    """
+    Limit this server worker's torch and faiss thread pools to its share of the CPUs.
+
+    Must run at startup, before torch or faiss are first imported: both size
+    their OpenMP pools from OMP_NUM_THREADS when they load, for every thread.
+    torch's intra-op pool is also set explicitly by configure_torch_threads.
+    """
+    os.environ.setdefault("OMP_NUM_THREADS", str(worker_thread_count()))
+
+
+def configure_torch_threads(num_threads: Optional[int] = None) -> None:
+    """
+    Size torch's intra-op and inter-op thread pools once per process.
+
+    Args:
+        num_threads: Intra-op threads to use (default: this process's share, see worker_thread_count)
+    """
+    global _torch_threads_configured
+    if _torch_threads_configured:
+        return
+
+    import torch
+
+    torch.set_num_threads(num_threads or worker_thread_count())
+    try:
+        torch.set_num_interop_threads(TORCH_INTEROP_THREADS)
+    except RuntimeError:
+        # Inter-op threads can't be resized once torch has started parallel work
+        pass
+
+    _torch_threads_configured = True
+
+
+def physical_cpu_count() -> int:
+    """Number of physical CPU cores, falling back to logical CPUs without psutil."""
+    try:
+        import psutil
+        return psutil.cpu_count(logical=False) or os.cpu_count() or 1
+    except ImportError:
+        return os.cpu_count() or 1
+
+
+def embed_shard(model_name: str, texts: List[str]) -> np.ndarray:
+    """Embed one shard of texts inside a worker process of an embedding pool."""
+    return np.asarray(create_embeddings(model_name).embed_documents(texts), dtype=np.float32)
+
+
+def create_embedding_pool() -> ProcessPoolExecutor:
+    """
+    Create a process pool with one embedding worker per physical core.
+
+    Each worker loads its own copy of the model (once, on first use) and
+    runs with a share of the CPU threads, which scales better on many-core
+    machines than a single process's intra-op parallelism.
 
     Returns:
-        HuggingFaceEmbeddings object
+        ProcessPoolExecutor to pass to embed_texts_parallel
+    """
+    num_workers = physical_cpu_count()
+    threads_per_worker = max(1, (os.cpu_count() or 1) // num_workers)
+
+    return ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=configure_torch_threads,
+        initargs=(threads_per_worker,)
+    )
+
+
+def embed_texts_parallel(texts: List[str], model_name: str, executor: ProcessPoolExecutor) -> np.ndarray:
     """
-    embeddings = HuggingFaceEmbeddings(
+    Embed texts by sharding them across the workers of an embedding pool.
+
+    Args:
+        texts: Texts to embed
+        model_name: Full embedding model name
+        executor: Pool created by create_embedding_pool
+
+    Returns:
+        (len(texts), dim) float32 matrix of embeddings in the same order as texts
+    """
+    shard_size = math.ceil(len(texts) / physical_cpu_count())
+    shards = [texts[start:start + shard_size] for start in range(0, len(texts), shard_size)]
+
+    return np.concatenate(list(executor.map(embed_shard, [model_name] * len(shards), shards)))
+
+
+@functools.lru_cache(maxsize=len(SUPPORTED_EMBEDDING_MODELS))
+def _load_embeddings(model_name: str) -> HuggingFaceEmbeddings:
+    """Instantiate the embeddings model; cached so each model loads once per process."""
+    configure_torch_threads()
+    # SentenceTransformer.encode already length-sorts its input, so mini-batches are padded only to their own longest text
+    return _huggingface_embeddings()(
         model_name=model_name,
         model_kwargs={'device': 'cpu'},
-        encode_kwargs={'normalize_embeddings': True}
+        encode_kwargs={'normalize_embeddings': True, 'batch_size': 64}
     )
 
-    return embeddings
+
+def create_embeddings(model_name: str) -> HuggingFaceEmbeddings:
+    """
+    Create HuggingFace embeddings model.
+
+    Models are cached per process, so repeated calls with the same model
+    name reuse the already loaded weights and tokenizer.
+
+    Args:
+        model_name: Name of the HuggingFace model (e.g., "sentence-transformers/all-MiniLM-L6-v2")
+
+    Returns:
+        HuggingFaceEmbeddings object
+    """
+    with _model_lock:
+        return _load_embeddings(model_name)
 
 
 def get_model_short_name(model_name: str) -> str:
@@ -144,69 +726,360 @@ def get_vector_store_path(vector_db: str, model_name: str) -> Path:
     return VECTOR_STORE_DIR / store_name
 
 
+def create_faiss_vector_store(
+    texts: List[str],
+    vectors: np.ndarray,
+    metadatas: List[Dict],
+    embeddings: HuggingFaceEmbeddings,
+    index_type: str = "flat",
+    precision: Literal["fp32", "fp16", "int8"] = "fp16",
+    hnsw_m: int = DEFAULT_HNSW_M,
+    ef_search: int = DEFAULT_HNSW_EF_SEARCH
+) -> Tuple[FAISS, Dict]:
+    """
+    Build a LangChain FAISS store around an explicitly constructed index.
+
+    Small corpora use an exact flat index; corpora above HNSW_MIN_CHUNKS use
+    IndexHNSWFlat, whose query cost grows roughly logarithmically with size.
+    With index_type="ivfpq", corpora above IVFPQ_MIN_CHUNKS are stored as
+    product-quantized codes (IndexIVFPQ, ~16 bytes per vector) instead.
+
+    Embeddings are unit-normalized, so every index ranks by inner product
+    (equal to cosine similarity) rather than L2 distance.
+
+    Flat and HNSW indexes store vectors at the requested precision. The
+    embeddings are unit-normalized, so fp16 keeps distances accurate to 3-4
+    decimals while halving index size and load bandwidth.
+
+    Args:
+        texts: Chunk texts
+        vectors: (len(texts), dim) float32 embedding matrix
+        metadatas: Chunk metadata dicts
+        embeddings: HuggingFace embeddings object (used to embed queries)
+        index_type: "flat" or "ivfpq"
+        precision: Stored vector precision for flat/HNSW indexes ("fp32", "fp16" or "int8")
+        hnsw_m: Number of graph neighbours per node for HNSW
+        ef_search: HNSW search beam width
+
+    Returns:
+        Tuple of (FAISS vector store, index settings to record in metadata.json)
+    """
+    if index_type not in ("flat", "ivfpq"):
+        raise ValueError(f"Unsupported index type: {index_type}")
+
+    if precision != "fp32" and precision not in PRECISION_QUANTIZER_TYPES:
+        raise ValueError(f"Unsupported precision: {precision}")
+
+    import faiss
+
+    dim = vectors.shape[1]
+
+    if index_type == "ivfpq" and len(texts) > IVFPQ_MIN_CHUNKS:
+        nlist = int(math.sqrt(len(texts)))
+        nprobe = min(IVFPQ_MAX_NPROBE, nlist)
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, IVFPQ_M, IVFPQ_NBITS, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+        index.nprobe = nprobe
+        index_info = {
+            "index_type": "ivfpq",
+            "nlist": nlist,
+            "m": IVFPQ_M,
+            "nbits": IVFPQ_NBITS,
+            "nprobe": nprobe
+        }
+    elif len(texts) > HNSW_MIN_CHUNKS:
+        if precision == "fp32":
+            index = faiss.IndexHNSWFlat(dim, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        else:
+            qtype = getattr(faiss.ScalarQuantizer, PRECISION_QUANTIZER_TYPES[precision])
+            index = faiss.IndexHNSWSQ(dim, qtype, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = ef_search
+        index_info = {"index_type": "hnsw", "dtype": precision, "hnsw_m": hnsw_m, "ef_search": ef_search}
+    else:
+        if precision == "fp32":
+            index = faiss.IndexFlatIP(dim)
+        else:
+            qtype = getattr(faiss.ScalarQuantizer, PRECISION_QUANTIZER_TYPES[precision])
+            index = faiss.IndexScalarQuantizer(dim, qtype, faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+        index_info = {"index_type": "flat", "dtype": precision}
+
+    index.add(vectors)
+    index_info["metric"] = "ip"
+
+    ids = [str(uuid.uuid4()) for _ in texts]
+    docstore = _in_memory_docstore()({
+        doc_id: Document(page_content=text, metadata=metadata)
+        for doc_id, text, metadata in zip(ids, texts, metadatas)
+    })
+
+    vectorstore = _faiss()(
+        embedding_function=embeddings,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=dict(enumerate(ids)),
+        distance_strategy=_distance_strategy().MAX_INNER_PRODUCT
+    )
+
+    return vectorstore, index_info
+
+
 def build_and_persist_vector_store(
-    chunks: List[Document],
+    chunks: Iterable[Document],
     embeddings: HuggingFaceEmbeddings,
     vector_db: str,
-    model_name: str
-) -> Tuple[object, Path]:
+    model_name: str,
+    index_type: str = "flat",
+    precision: Literal["fp32", "fp16", "int8"] = "fp16",
+    hnsw_m: int = DEFAULT_HNSW_M,
+    ef_search: int = DEFAULT_HNSW_EF_SEARCH
+) -> Tuple[object, Path, int]:
     """
     Build vector store from chunks and persist to disk.
 
+    Chunks are consumed and embedded in batches, so chunks may be a lazy
+    iterator (see iter_chunks) rather than a fully materialized list. Batches
+    are pulled from the iterator on a background thread, so producing chunks
+    overlaps with embedding them.
+
+    Callers should hold the store's get_vector_store_lock while building, so
+    concurrent builds of the same store can't interleave their writes.
+
     Args:
-        chunks: List of document chunks
+        chunks: Document chunks (list or iterator)
         embeddings: HuggingFace embeddings object
         vector_db: Vector database type ("FAISS" or "Chroma")
         model_name: Full embedding model name
+        index_type: FAISS index family, "flat" or "ivfpq" (product quantization for very large corpora)
+        precision: FAISS stored vector precision, "fp32", "fp16" or "int8"
+        hnsw_m: HNSW graph degree, used when FAISS switches to an HNSW index
+        ef_search: HNSW search beam width, used when FAISS switches to an HNSW index
 
     Returns:
-        Tuple of (vector store object, path where it was saved)
+        Tuple of (vector store object, path where it was saved, number of chunks indexed)
     """
     store_path = get_vector_store_path(vector_db, model_name)
 
+    if vector_db.upper() not in ("FAISS", "CHROMA"):
+        raise ValueError(f"Unsupported vector database: {vector_db}")
+
+    cache = EmbeddingCache(model_name)
+    texts = []
+    metadatas = []
+    vector_batches = []
+
+    with contextlib.ExitStack() as stack:
+        executor = None
+
+        for batch in prefetch(iter_batches(chunks, EMBED_BATCH_SIZE)):
+            # Once the input turns out to be large, embed the remaining batches' cache
+            # misses across a pool of worker processes
+            if executor is None and len(texts) >= PARALLEL_EMBED_MIN_TEXTS and physical_cpu_count() > 1:
+                executor = stack.enter_context(create_embedding_pool())
+
+            batch_texts = [chunk.page_content for chunk in batch]
+
+            # Only chunks not seen in a previous build go through the model
+            vector_batches.append(embed_texts_cached(batch_texts, embeddings, cache, executor))
+            texts.extend(batch_texts)
+            metadatas.extend(chunk.metadata for chunk in batch)
+
+    if not texts:
+        raise ValueError("No chunks to index")
+
+    # Keep the new embeddings for the next rebuild
+    cache.save()
+
+    vectors = np.concatenate(vector_batches)
+    index_info = {}
+
     # Create vector store based on type
     if vector_db.upper() == "FAISS":
-        vectorstore = FAISS.from_documents(chunks, embeddings)
+        vectorstore, index_info = create_faiss_vector_store(
+            texts,
+            vectors,
+            metadatas,
+            embeddings,
+            index_type=index_type,
+            precision=precision,
+            hnsw_m=hnsw_m,
+            ef_search=ef_search
+        )
 
-        # Persist FAISS index
+        # Persist FAISS index. Files are written to this build's own scratch directory and renamed
+        # into place, so processes that memory-mapped the old index keep a valid mapping.
         store_path.mkdir(parents=True, exist_ok=True)
-        vectorstore.save_local(str(store_path))
+        tmp_path = Path(tempfile.mkdtemp(prefix=".tmp", dir=store_path))
+        try:
+            vectorstore.save_local(str(tmp_path))
+            for file_name in ("index.faiss", "index.pkl"):
+                os.replace(tmp_path / file_name, store_path / file_name)
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
 
-    elif vector_db.upper() == "CHROMA":
+    else:
         # For Chroma, the persist_directory is set during creation
         store_path.mkdir(parents=True, exist_ok=True)
-        vectorstore = Chroma.from_documents(
-            chunks,
-            embeddings,
-            persist_directory=str(store_path)
+        vectorstore = _chroma()(
+            persist_directory=str(store_path),
+            embedding_function=embeddings
         )
-        # Chroma auto-persists
 
-    else:
-        raise ValueError(f"Unsupported vector database: {vector_db}")
+        # Insert the precomputed vectors directly instead of re-embedding via add_texts
+        for start in range(0, len(texts), CHROMA_ADD_BATCH_SIZE):
+            end = start + CHROMA_ADD_BATCH_SIZE
+            vectorstore._collection.add(
+                ids=[str(uuid.uuid4()) for _ in range(start, min(end, len(texts)))],
+                embeddings=vectors[start:end].tolist(),
+                metadatas=metadatas[start:end],
+                documents=texts[start:end]
+            )
+        # Chroma auto-persists
 
     # Save metadata
     metadata = {
         "vector_db": vector_db,
         "embedding_model": model_name,
-        "num_chunks": len(chunks),
-        "created_at": time.strftime("%Y-%m-%d %H:%M:%S")
+        "num_chunks": len(texts),
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        **index_info
     }
 
+    # Write to a temp file and rename, so readers never see a half-written metadata.json
     metadata_path = store_path / "metadata.json"
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    tmp_path = metadata_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(metadata))
+    os.replace(tmp_path, metadata_path)
 
-    return vectorstore, store_path
+    return vectorstore, store_path, len(texts)
 
 
-def load_vector_store(vector_db: str, model_name: str) -> Optional[object]:
+def get_vector_store_lock(vector_db: str, model_name: str) -> FileLock:
+    """
+    Get the lock that serializes builds of one vector store across processes.
+
+    The lock file sits next to the store directory rather than inside it, so
+    taking the lock doesn't create an empty store directory.
+
+    Args:
+        vector_db: Vector database type ("FAISS" or "Chroma")
+        model_name: Full embedding model name
+
+    Returns:
+        FileLock for the store (not yet acquired)
+    """
+    return FileLock(VECTOR_STORE_DIR / f"{get_vector_store_path(vector_db, model_name).name}.lock")
+
+
+def read_vector_store_metadata(store_path: Path) -> Dict:
+    """
+    Read the metadata.json written alongside a persisted vector store.
+
+    Args:
+        store_path: Vector store directory
+
+    Returns:
+        Metadata dictionary, or an empty dict if missing or unreadable
+    """
+    metadata_path = store_path / "metadata.json"
+
+    try:
+        return orjson.loads(metadata_path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+
+def get_distance_strategy(metadata: Dict) -> DistanceStrategy:
+    """
+    Get the LangChain distance strategy matching a FAISS store's index metric.
+
+    Args:
+        metadata: Vector store metadata (stores built before the metric was recorded use L2)
+
+    Returns:
+        DistanceStrategy for the FAISS wrapper
+    """
+    if metadata.get("metric") == "ip":
+        return _distance_strategy().MAX_INNER_PRODUCT
+    return _distance_strategy().EUCLIDEAN_DISTANCE
+
+
+def to_l2_distance(score, vectorstore: object):
+    """
+    Express raw search scores as squared L2 distances.
+
+    Inner-product stores return cosine similarities; for unit vectors the
+    squared L2 distance is 2 - 2 * cosine, so converting keeps similarity
+    scores comparable between inner-product and L2 stores.
+
+    Args:
+        score: Score, or NumPy array of scores, returned by a similarity search
+        vectorstore: Vector store that produced the scores
+
+    Returns:
+        Squared L2 distance(s) (lower is more similar)
+    """
+    if getattr(vectorstore, "distance_strategy", None) == _distance_strategy().MAX_INNER_PRODUCT:
+        # Clamp tiny negatives caused by quantized (fp16/int8) vectors
+        return np.maximum(0.0, 2.0 - 2.0 * score)
+    return score
+
+
+def load_faiss_mmap(
+    store_path: Path,
+    embeddings: HuggingFaceEmbeddings,
+    distance_strategy: Optional[DistanceStrategy] = None
+) -> FAISS:
+    """
+    Load a persisted FAISS store with its index memory-mapped.
+
+    The OS pages the index in lazily instead of copying the whole file onto
+    the heap, which keeps cold-start memory close to the file size. The index
+    files must not be modified in place while mapped; rebuilds replace them
+    by rename instead (see build_and_persist_vector_store).
+
+    IO_FLAG_MMAP maps the inverted lists of IVF indexes. Flat and scalar
+    quantizer (fp16/int8) codes are only mapped by faiss versions that
+    provide IO_FLAG_MMAP_IFC; older versions read them into memory.
+
+    Args:
+        store_path: FAISS vector store directory
+        embeddings: HuggingFace embeddings object
+        distance_strategy: Distance strategy matching the index metric (default: L2)
+
+    Returns:
+        FAISS vector store object
+    """
+    import faiss
+
+    io_flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY | getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+    index = faiss.read_index(str(store_path / "index.faiss"), io_flags)
+
+    with open(store_path / "index.pkl", 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            docstore, index_to_docstore_id = pickle.load(mapped)
+
+    return _faiss()(
+        embedding_function=embeddings,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=index_to_docstore_id,
+        distance_strategy=distance_strategy or _distance_strategy().EUCLIDEAN_DISTANCE
+    )
+
+
+def load_vector_store(vector_db: str, model_name: str, use_mmap: bool = True) -> Optional[object]:
     """
     Load a persisted vector store from disk.
 
     Args:
         vector_db: Vector database type ("FAISS" or "Chroma")
         model_name: Full embedding model name
+        use_mmap: Memory-map the FAISS index instead of reading it onto the heap
 
     Returns:
         Vector store object or None if not found
@@ -221,13 +1094,36 @@ def load_vector_store(vector_db: str, model_name: str) -> Optional[object]:
 
     try:
         if vector_db.upper() == "FAISS":
-            vectorstore = FAISS.load_local(
-                str(store_path),
-                embeddings,
-                allow_dangerous_deserialization=True
-            )
+            metadata = read_vector_store_metadata(store_path)
+            distance_strategy = get_distance_strategy(metadata)
+
+            vectorstore = None
+            if use_mmap:
+                try:
+                    vectorstore = load_faiss_mmap(store_path, embeddings, distance_strategy)
+                except Exception as e:
+                    # Not every index type supports mmap, fall back to a regular load
+                    print(f"Memory-mapped load failed, reading index into memory: {str(e)}")
+
+            if vectorstore is None:
+                vectorstore = _faiss().load_local(
+                    str(store_path),
+                    embeddings,
+                    allow_dangerous_deserialization=True,
+                    distance_strategy=distance_strategy
+                )
+
+            # Search-time knobs are not part of the index build, so (re)apply them on every load
+            hnsw = getattr(vectorstore.index, "hnsw", None)
+            if hnsw is not None:
+                hnsw.efSearch = metadata.get("ef_search", DEFAULT_HNSW_EF_SEARCH)
+            if metadata.get("index_type") == "ivfpq":
+                import faiss
+                faiss.extract_index_ivf(vectorstore.index).nprobe = metadata.get(
+                    "nprobe", min(IVFPQ_MAX_NPROBE, metadata.get("nlist", 1))
+                )
         elif vector_db.upper() == "CHROMA":
-            vectorstore = Chroma(
+            vectorstore = _chroma()(
                 persist_directory=str(store_path),
                 embedding_function=embeddings
             )
@@ -240,6 +1136,123 @@ def load_vector_store(vector_db: str, model_name: str) -> Optional[object]:
         return None
 
 
+def get_vector_store_version(vector_db: str, model_name: str) -> int:
+    """
+    Get a version stamp for a persisted vector store.
+
+    Every build rewrites metadata.json, so its modification time changes
+    whenever the store is rebuilt, including by another worker process.
+
+    Args:
+        vector_db: Vector database type ("FAISS" or "Chroma")
+        model_name: Full embedding model name
+
+    Returns:
+        mtime_ns of the store's metadata.json, or 0 if it has none
+    """
+    try:
+        return (get_vector_store_path(vector_db, model_name) / "metadata.json").stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def get_cached_vector_store(vector_db: str, model_name: str) -> Optional[object]:
+    """
+    Load a persisted vector store, reusing an already loaded copy when possible.
+
+    Stores are cached per process and reloaded when they have been rebuilt
+    since they were loaded (see get_vector_store_version). Failed loads are
+    not cached.
+
+    Args:
+        vector_db: Vector database type ("FAISS" or "Chroma")
+        model_name: Full embedding model name
+
+    Returns:
+        Vector store object or None if not found
+    """
+    key = (vector_db, model_name)
+    version = get_vector_store_version(vector_db, model_name)
+
+    with _vector_store_lock:
+        cached = _vector_store_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        vectorstore = load_vector_store(vector_db, model_name)
+        if vectorstore is not None:
+            _vector_store_cache[key] = (version, vectorstore)
+
+        return vectorstore
+
+
+def similarity_search_by_vectors(
+    vectorstore: object,
+    query_vectors: np.ndarray,
+    k: int
+) -> List[List[Tuple[Document, float]]]:
+    """
+    Search a vector store with a whole matrix of query vectors in one call.
+
+    FAISS stores are searched directly through index.search; Chroma stores
+    through a single collection query.
+
+    Args:
+        vectorstore: FAISS or Chroma vector store
+        query_vectors: (num_queries, dim) float32 matrix of query embeddings
+        k: Number of results per query
+
+    Returns:
+        One list of (Document, raw score) pairs per query, best match first
+    """
+    if isinstance(vectorstore, _faiss()):
+        distances, indices = vectorstore.index.search(query_vectors, k)
+
+        results = []
+        for row_distances, row_indices in zip(distances.tolist(), indices.tolist()):
+            hits = []
+            for distance, i in zip(row_distances, row_indices):
+                # FAISS pads rows with -1 when fewer than k vectors match
+                if i == -1:
+                    continue
+                doc = vectorstore.docstore.search(vectorstore.index_to_docstore_id[i])
+                hits.append((doc, distance))
+            results.append(hits)
+        return results
+
+    response = vectorstore._collection.query(
+        query_embeddings=query_vectors.tolist(),
+        n_results=k,
+        include=["documents", "metadatas", "distances"]
+    )
+
+    return [
+        [
+            (Document(page_content=text, metadata=metadata or {}), distance)
+            for text, metadata, distance in zip(texts, metadatas, distances)
+        ]
+        for texts, metadatas, distances in zip(
+            response["documents"], response["metadatas"], response["distances"]
+        )
+    ]
+
+
+def batch_similarity_search(vectorstore: object, queries: List[str], k: int) -> List[List[Tuple[Document, float]]]:
+    """
+    Run several queries against a vector store with one embedding pass and one search.
+
+    Args:
+        vectorstore: FAISS or Chroma vector store
+        queries: Query strings
+        k: Number of results per query
+
+    Returns:
+        One list of (Document, raw score) pairs per query, best match first
+    """
+    query_vectors = np.asarray(vectorstore.embeddings.embed_documents(queries), dtype=np.float32)
+    return similarity_search_by_vectors(vectorstore, query_vectors, k)
+
+
 def get_all_vector_stores() -> List[Dict]:
     """
     Get information about all existing vector stores.
@@ -253,32 +1266,33 @@ def get_all_vector_stores() -> List[Dict]:
         return vector_stores
 
     # Iterate through all directories in Vector_Store
-    for store_dir in VECTOR_STORE_DIR.iterdir():
-        if store_dir.is_dir():
-            metadata_path = store_dir / "metadata.json"
+    with os.scandir(VECTOR_STORE_DIR) as entries:
+        store_dirs = [Path(entry.path) for entry in entries if entry.is_dir()]
 
-            if metadata_path.exists():
-                try:
-                    with open(metadata_path, 'r') as f:
-                        metadata = json.load(f)
+    for store_dir in store_dirs:
+        metadata_path = store_dir / "metadata.json"
 
-                    # Add directory name
-                    metadata['store_name'] = store_dir.name
-                    vector_stores.append(metadata)
-                except Exception as e:
-                    print(f"Error reading metadata for {store_dir.name}: {str(e)}")
-                    continue
-            else:
-                # If no metadata, try to infer from directory name
-                parts = store_dir.name.split('_', 1)
-                if len(parts) == 2:
-                    vector_stores.append({
-                        "store_name": store_dir.name,
-                        "vector_db": parts[0],
-                        "embedding_model": f"sentence-transformers/{parts[1]}",
-                        "num_chunks": "Unknown",
-                        "created_at": "Unknown"
-                    })
+        if metadata_path.exists():
+            try:
+                metadata = orjson.loads(metadata_path.read_bytes())
+
+                # Add directory name
+                metadata['store_name'] = store_dir.name
+                vector_stores.append(metadata)
+            except Exception as e:
+                print(f"Error reading metadata for {store_dir.name}: {str(e)}")
+                continue
+        else:
+            # If no metadata, try to infer from directory name
+            parts = store_dir.name.split('_', 1)
+            if len(parts) == 2:
+                vector_stores.append({
+                    "store_name": store_dir.name,
+                    "vector_db": parts[0],
+                    "embedding_model": f"sentence-transformers/{parts[1]}",
+                    "num_chunks": "Unknown",
+                    "created_at": "Unknown"
+                })
 
     return vector_stores
 
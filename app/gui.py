@@ -3,19 +3,43 @@ API Routes module for Semantic Search Engine.
 Contains all API endpoints organized by tasks.
 """
 import os
+import stat
+import uuid
+import asyncio
+import functools
+import itertools
+import threading
+from collections import deque
 from pathlib import Path
-from typing import List
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from typing import List, Optional, Tuple
+
+import aiofiles
+import numpy as np
+import orjson
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, HTTPException
+from fastapi.responses import JSONResponse, ORJSONResponse, FileResponse
 from pydantic import BaseModel
 
-from app.config import DATA_DIR, SUPPORTED_EMBEDDING_MODELS, SUPPORTED_VECTOR_DBS
+from app.config import DATA_DIR, EMBEDDING_JOBS_DIR, SUPPORTED_EMBEDDING_MODELS, SUPPORTED_VECTOR_DBS
 from app import embedding_utils
 import time
 
 # Create API router
 router = APIRouter()
 
+# Uploads are streamed to disk in chunks of this size
+FILE_CHUNK_SIZE = 1 << 20
+
+# Maximum number of characters returned in the JSON document content response
+MAX_DOCUMENT_CONTENT_CHARS = 10 * (1 << 20)
+
+# File extensions (without the dot) accepted by the upload endpoint
+ALLOWED_UPLOAD_EXTENSIONS = frozenset({'txt', 'md', 'pdf'})
+
+# Units for format_file_size and their divisors, each 1024x the previous one
+SIZE_UNITS = ("Bytes", "KB", "MB", "GB", "TB")
+SIZE_DIVISORS = tuple(1 << (10 * i) for i in range(len(SIZE_UNITS)))
+
 
 # ============================================================================
 # Helper Functions
@@ -23,31 +47,69 @@ router = APIRouter()
 
 def format_file_size(size_bytes: int) -> str:
     """Convert bytes to human-readable format."""
-    if size_bytes == 0:
+    if not size_bytes:
         return "0 Bytes"
 
-    units = ["Bytes", "KB", "MB", "GB"]
-    unit_index = 0
-    size = float(size_bytes)
+    # Every unit is 2**10 times the previous one, so the unit follows from the bit length
+    unit_index = min(len(SIZE_UNITS) - 1, (size_bytes.bit_length() - 1) // 10)
 
-    while size >= 1024 and unit_index < len(units) - 1:
-        size /= 1024
-        unit_index += 1
+    return f"{size_bytes / SIZE_DIVISORS[unit_index]:.2f} {SIZE_UNITS[unit_index]}"
 
-    return f"{size:.2f} {units[unit_index]}"
+
+@functools.lru_cache(maxsize=4096)
+def read_file_preview(path_str: str, mtime_ns: int, size: int, max_chars: int) -> str:
+    """
+    Read the preview of a file. Cached per (path, mtime, size), so an
+    unchanged file is only read once.
+    """
+    try:
+        # One raw read is enough: UTF-8 needs at most 4 bytes per character
+        fd = os.open(path_str, os.O_RDONLY)
+        try:
+            raw = os.read(fd, max_chars * 4)
+        finally:
+            os.close(fd)
+
+        # Normalize newlines like text-mode reads do
+        content = raw.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+        if len(content) >= max_chars:
+            content = content[:max_chars] + "..."
+        return content
+    except Exception as e:
+        return f"Error reading file: {str(e)}"
 
 
-def get_file_preview(file_path: Path, max_chars: int = 200) -> str:
+def get_file_preview(file_path: Path | str, max_chars: int = 200, file_stat: Optional[os.stat_result] = None) -> str:
     """Get a preview of file content (first max_chars characters)."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read(max_chars)
-            if len(content) == max_chars:
-                content += "..."
-            return content
+        if file_stat is None:
+            file_stat = os.stat(file_path)
     except Exception as e:
         return f"Error reading file: {str(e)}"
 
+    return read_file_preview(os.fspath(file_path), file_stat.st_mtime_ns, file_stat.st_size, max_chars)
+
+
+def to_similarity_scores(docs_with_scores: list, vectorstore: object) -> List[float]:
+    """
+    Convert the raw scores of search results to 0-1 similarity scores.
+
+    Scores are expressed as L2 distance, where lower scores are better, and
+    normalized as similarity = 1 / (1 + distance), rounded to 4 decimals.
+    """
+    scores = np.fromiter((score for _, score in docs_with_scores), dtype=np.float64, count=len(docs_with_scores))
+    distances = embedding_utils.to_l2_distance(scores, vectorstore)
+    return np.round(1.0 / (1.0 + distances), 4).tolist()
+
+
+async def save_upload(file: UploadFile) -> str:
+    """Stream an uploaded file into the data directory without buffering it whole."""
+    async with aiofiles.open(DATA_DIR / file.filename, 'wb') as out:
+        while chunk := await file.read(FILE_CHUNK_SIZE):
+            await out.write(chunk)
+
+    return file.filename
+
 
 # ============================================================================
 # Response Models
@@ -96,6 +158,15 @@ class EmbeddingGenerateResponse(BaseModel):
     time_taken_seconds: float
 
 
+class EmbeddingJobInfo(BaseModel):
+    job_id: str
+    status: str
+    started_at: float
+    updated_at: float
+    result: Optional[EmbeddingGenerateResponse] = None
+    error: Optional[str] = None
+
+
 class VectorStoreInfo(BaseModel):
     store_name: str
     vector_db: str
@@ -117,25 +188,33 @@ async def upload_documents(files: List[UploadFile] = File(...)):
     Returns:
         UploadResponse with list of successfully uploaded filenames
     """
-    uploaded_files = []
-    allowed_extensions = {'.txt', '.md', '.pdf'}
-
     try:
+        # Close rejected files right away to release their spooled temp files.
+        # Files are keyed by name so that, as when saving one by one, the last file with a given name wins
+        # instead of several writers interleaving chunks into the same path.
+        accepted_files = {}
         for file in files:
-            # Validate file extension
-            file_ext = Path(file.filename).suffix.lower()
-            if file_ext not in allowed_extensions:
-                continue
-
-            # Save file to data directory
-            file_path = DATA_DIR / file.filename
+            # Like Path.suffix, a leading dot alone (".txt") is a hidden file name, not an extension
+            stem, dot, ext = file.filename.rpartition('.')
+            if stem and dot and ext.lower() in ALLOWED_UPLOAD_EXTENSIONS:
+                replaced = accepted_files.pop(file.filename, None)
+                if replaced is not None:
+                    await replaced.close()
+                accepted_files[file.filename] = file
+            else:
+                await file.close()
+
+        # Save all files with a valid extension concurrently
+        results = await asyncio.gather(
+            *[save_upload(file) for file in accepted_files.values()],
+            return_exceptions=True
+        )
 
-            # Read and write file content
-            content = await file.read()
-            with open(file_path, 'wb') as f:
-                f.write(content)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
 
-            uploaded_files.append(file.filename)
+        uploaded_files = list(results)
 
         if not uploaded_files:
             return UploadResponse(
@@ -166,16 +245,19 @@ async def list_documents():
         documents = []
 
         # Iterate through all files in data directory
-        for file_path in DATA_DIR.iterdir():
-            if file_path.is_file():
-                file_size = file_path.stat().st_size
-
-                documents.append(DocumentInfo(
-                    filename=file_path.name,
-                    file_size_bytes=file_size,
-                    file_size_readable=format_file_size(file_size),
-                    preview=get_file_preview(file_path)
-                ))
+        # (fields are produced here, so model validation is skipped)
+        with os.scandir(DATA_DIR) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    file_stat = entry.stat()
+                    file_size = file_stat.st_size
+
+                    documents.append(DocumentInfo.model_construct(
+                        filename=entry.name,
+                        file_size_bytes=file_size,
+                        file_size_readable=format_file_size(file_size),
+                        preview=get_file_preview(entry.path, file_stat=file_stat)
+                    ))
 
         # Sort by filename
         documents.sort(key=lambda x: x.filename)
@@ -199,10 +281,11 @@ async def get_dataset_stats():
         total_size_bytes = 0
 
         # Calculate totals
-        for file_path in DATA_DIR.iterdir():
-            if file_path.is_file():
-                total_documents += 1
-                total_size_bytes += file_path.stat().st_size
+        with os.scandir(DATA_DIR) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    total_documents += 1
+                    total_size_bytes += entry.stat().st_size
 
         # Calculate average
         average_size_bytes = total_size_bytes // total_documents if total_documents > 0 else 0
@@ -219,37 +302,51 @@ async def get_dataset_stats():
 
 
 @router.get("/dataset/{filename}")
-async def get_document_content(filename: str):
+async def get_document_content(filename: str, raw: bool = False):
     """
     Get the full content of a specific document.
 
     Args:
         filename: Name of the file to read
+        raw: Send the file as text/plain instead of wrapping it in JSON
 
     Returns:
-        JSON with filename and full content
+        JSON with filename and content (truncated to MAX_DOCUMENT_CONTENT_CHARS),
+        or the file itself when raw is set
     """
     try:
         file_path = DATA_DIR / filename
 
-        # Check if file exists
-        if not file_path.exists():
+        # Check if file exists (a single stat answers both checks below)
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail=f"File '{filename}' not found")
 
         # Check if it's actually a file (not a directory)
-        if not file_path.is_file():
+        if not stat.S_ISREG(file_stat.st_mode):
             raise HTTPException(status_code=400, detail=f"'{filename}' is not a file")
 
-        # Read full content
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Let the server send the file directly (sendfile where available)
+        if raw:
+            return FileResponse(file_path, media_type="text/plain", stat_result=file_stat)
+
+        # Read content without blocking the event loop, bounded so huge files can't exhaust memory
+        async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
+            content = await f.read(MAX_DOCUMENT_CONTENT_CHARS + 1)
 
-        return {
+        truncated = len(content) > MAX_DOCUMENT_CONTENT_CHARS
+        if truncated:
+            content = content[:MAX_DOCUMENT_CONTENT_CHARS]
+
+        # Free-form payload, serialize directly with orjson
+        return ORJSONResponse({
             "filename": filename,
             "content": content,
-            "size_bytes": file_path.stat().st_size,
-            "size_readable": format_file_size(file_path.stat().st_size)
-        }
+            "size_bytes": file_stat.st_size,
+            "size_readable": format_file_size(file_stat.st_size),
+            "truncated": truncated
+        })
 
     except HTTPException:
         raise
@@ -271,12 +368,14 @@ async def delete_document(filename: str):
     try:
         file_path = DATA_DIR / filename
 
-        # Check if file exists
-        if not file_path.exists():
+        # Check if file exists (a single stat answers both checks below)
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail=f"File '{filename}' not found")
 
         # Check if it's actually a file (not a directory)
-        if not file_path.is_file():
+        if not stat.S_ISREG(file_stat.st_mode):
             raise HTTPException(status_code=400, detail=f"'{filename}' is not a file")
 
         # Delete the file
@@ -325,20 +424,181 @@ async def get_vector_dbs():
         raise HTTPException(status_code=500, detail=f"Error fetching vector DBs: {str(e)}")
 
 
-@router.post("/embedding/generate", response_model=EmbeddingGenerateResponse)
-async def generate_embeddings(request: EmbeddingGenerateRequest):
+# Running jobs re-save themselves at this interval. A running job not updated for
+# EMBEDDING_JOB_STALE_SECONDS has lost its worker (crash, restart or shutdown) and is reported as failed.
+EMBEDDING_JOB_HEARTBEAT_SECONDS = 10
+EMBEDDING_JOB_STALE_SECONDS = 60
+
+# Job files not updated for this long are deleted when a new job starts
+EMBEDDING_JOB_TTL_SECONDS = 24 * 60 * 60
+
+
+def save_embedding_job(job: dict) -> None:
+    """
+    Persist an embedding job as EMBEDDING_JOBS_DIR/{job_id}.json.
+
+    Jobs live on disk rather than in process memory so that any uvicorn
+    worker can report on a job started by another one.
     """
-    Generate embeddings and build vector store from documents in data directory.
+    job_path = EMBEDDING_JOBS_DIR / f"{job['job_id']}.json"
+    tmp_path = job_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(job))
+    # Atomic rename, so pollers never read a half-written job
+    os.replace(tmp_path, job_path)
+
+
+def load_embedding_job(job_id: str) -> Optional[dict]:
+    """Read a persisted embedding job, or None if there is no such job."""
+    # Job ids are uuid4 hex strings, this also keeps the id from escaping the jobs directory
+    if not job_id.isalnum():
+        return None
+
+    try:
+        return orjson.loads((EMBEDDING_JOBS_DIR / f"{job_id}.json").read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def prune_embedding_jobs() -> None:
+    """Delete job files that have not been updated within EMBEDDING_JOB_TTL_SECONDS."""
+    cutoff = time.time() - EMBEDDING_JOB_TTL_SECONDS
+
+    with os.scandir(EMBEDDING_JOBS_DIR) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    # Already pruned by another worker
+                    pass
+
+
+def run_embedding_generation(request: EmbeddingGenerateRequest) -> EmbeddingGenerateResponse:
+    """
+    Load, chunk and embed the dataset and persist the vector store.
 
     Args:
-        request: EmbeddingGenerateRequest with embedding_model and vector_db
+        request: Validated EmbeddingGenerateRequest
 
     Returns:
         EmbeddingGenerateResponse with statistics about the generated embeddings
     """
+    start_time = time.perf_counter_ns()
+
+    # Step 1: Read documents lazily, so file reads overlap with embedding in step 4
+    num_documents = 0
+
+    def count_documents(documents):
+        nonlocal num_documents
+        for doc in documents:
+            num_documents += 1
+            yield doc
+
+    documents = count_documents(embedding_utils.iter_documents_from_data_dir())
+    first_document = next(documents, None)
+
+    if first_document is None:
+        raise HTTPException(
+            status_code=400,
+            detail="No documents found in data directory. Please upload documents first."
+        )
+
+    # Step 2: Chunk documents lazily, splitting overlaps with embedding in step 4
+    chunks = embedding_utils.iter_chunks(
+        itertools.chain([first_document], documents),
+        chunk_size=500,
+        chunk_overlap=50
+    )
+    first_chunk = next(chunks, None)
+
+    if first_chunk is None:
+        raise HTTPException(
+            status_code=400,
+            detail="No chunks created from documents. Documents may be empty."
+        )
+
+    # Step 3: Create embeddings
+    embeddings = embedding_utils.create_embeddings(request.embedding_model)
+
+    # Get embedding dimension
+    embedding_dim = embedding_utils.get_embedding_dimension(embeddings)
+
+    # Step 4: Build and persist vector store
+    # num_documents is final once the chunk iterator has been fully consumed here
+    vectorstore, store_path, num_chunks = embedding_utils.build_and_persist_vector_store(
+        chunks=itertools.chain([first_chunk], chunks),
+        embeddings=embeddings,
+        vector_db=request.vector_db,
+        model_name=request.embedding_model
+    )
+
+    # Calculate time taken
+    time_taken = (time.perf_counter_ns() - start_time) / 1e9
+
+    return EmbeddingGenerateResponse(
+        number_of_documents=num_documents,
+        number_of_chunks=num_chunks,
+        embedding_model=request.embedding_model,
+        vector_db=request.vector_db,
+        embedding_dimension=embedding_dim,
+        time_taken_seconds=round(time_taken, 2)
+    )
+
+
+def run_embedding_job(job: dict, request: EmbeddingGenerateRequest, store_lock: embedding_utils.FileLock) -> None:
+    """Run an embedding generation job in the background, record its outcome and release the store lock."""
     try:
-        start_time = time.time()
+        run_locked_embedding_job(job, request)
+    finally:
+        store_lock.release()
+
+
+def run_locked_embedding_job(job: dict, request: EmbeddingGenerateRequest) -> None:
+    """Run an embedding generation job whose vector store lock is already held."""
+    stop_heartbeat = threading.Event()
+
+    def heartbeat():
+        # Shows pollers the job is still alive, see EMBEDDING_JOB_STALE_SECONDS
+        while not stop_heartbeat.wait(EMBEDDING_JOB_HEARTBEAT_SECONDS):
+            job["updated_at"] = time.time()
+            save_embedding_job(job)
+
+    heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
+    heartbeat_thread.start()
+
+    try:
+        job["result"] = run_embedding_generation(request).model_dump()
+        job["status"] = "completed"
+    except HTTPException as e:
+        job["error"] = e.detail
+        job["status"] = "failed"
+    except Exception as e:
+        job["error"] = f"Error generating embeddings: {str(e)}"
+        job["status"] = "failed"
+    finally:
+        # Stop the heartbeat first so it can't write the job file concurrently with the final save
+        stop_heartbeat.set()
+        heartbeat_thread.join()
+
+    job["updated_at"] = time.time()
+    save_embedding_job(job)
 
+
+@router.post("/embedding/generate", response_model=EmbeddingJobInfo, status_code=202)
+async def generate_embeddings(request: EmbeddingGenerateRequest, background_tasks: BackgroundTasks):
+    """
+    Start generating embeddings and building the vector store from documents in data directory.
+
+    The work runs as a background task; poll /embedding/jobs/{job_id} for its result.
+
+    Args:
+        request: EmbeddingGenerateRequest with embedding_model and vector_db
+
+    Returns:
+        EmbeddingJobInfo for the started job
+    """
+    try:
         # Validate inputs
         if request.embedding_model not in SUPPORTED_EMBEDDING_MODELS:
             raise HTTPException(
@@ -352,55 +612,70 @@ async def generate_embeddings(request: EmbeddingGenerateRequest):
                 detail=f"Invalid vector database. Supported databases: {SUPPORTED_VECTOR_DBS}"
             )
 
-        # Step 1: Load documents from data directory
-        documents, num_documents = embedding_utils.load_documents_from_data_dir()
-
-        if num_documents == 0:
+        # Only one build per store at a time, across all workers; the job releases the lock when it ends
+        store_lock = embedding_utils.get_vector_store_lock(request.vector_db, request.embedding_model)
+        if not store_lock.acquire(blocking=False):
             raise HTTPException(
-                status_code=400,
-                detail="No documents found in data directory. Please upload documents first."
+                status_code=409,
+                detail=f"Embeddings for {request.vector_db} with {request.embedding_model} are already being generated"
             )
 
-        # Step 2: Chunk documents
-        chunks = embedding_utils.chunk_documents(documents, chunk_size=500, chunk_overlap=50)
-        num_chunks = len(chunks)
+        try:
+            prune_embedding_jobs()
 
-        if num_chunks == 0:
-            raise HTTPException(
-                status_code=400,
-                detail="No chunks created from documents. Documents may be empty."
-            )
+            now = time.time()
+            job = {
+                "job_id": uuid.uuid4().hex,
+                "status": "running",
+                "started_at": now,
+                "updated_at": now,
+                "result": None,
+                "error": None
+            }
+            save_embedding_job(job)
 
-        # Step 3: Create embeddings
-        embeddings = embedding_utils.create_embeddings(request.embedding_model)
+            # Runs after the response is sent, on the threadpool since run_embedding_job is synchronous
+            background_tasks.add_task(run_embedding_job, dict(job), request, store_lock)
+        except BaseException:
+            store_lock.release()
+            raise
 
-        # Get embedding dimension
-        embedding_dim = embedding_utils.get_embedding_dimension(embeddings)
+        return job
 
-        # Step 4: Build and persist vector store
-        vectorstore, store_path = embedding_utils.build_and_persist_vector_store(
-            chunks=chunks,
-            embeddings=embeddings,
-            vector_db=request.vector_db,
-            model_name=request.embedding_model
-        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating embeddings: {str(e)}")
 
-        # Calculate time taken
-        time_taken = time.time() - start_time
 
-        return EmbeddingGenerateResponse(
-            number_of_documents=num_documents,
-            number_of_chunks=num_chunks,
-            embedding_model=request.embedding_model,
-            vector_db=request.vector_db,
-            embedding_dimension=embedding_dim,
-            time_taken_seconds=round(time_taken, 2)
-        )
+@router.get("/embedding/jobs/{job_id}", response_model=EmbeddingJobInfo)
+async def get_embedding_job(job_id: str):
+    """
+    Get the status of an embedding generation job.
+
+    Args:
+        job_id: Job id returned by /embedding/generate
+
+    Returns:
+        EmbeddingJobInfo with status, and result or error once finished
+    """
+    try:
+        job = load_embedding_job(job_id)
+
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Embedding job '{job_id}' not found")
+
+        # Only reported, not saved: a late heartbeat from a live job would overwrite it anyway
+        if job["status"] == "running" and time.time() - job["updated_at"] > EMBEDDING_JOB_STALE_SECONDS:
+            job["status"] = "failed"
+            job["error"] = "Embedding job stopped before finishing, the server may have been restarted. Please try again."
+
+        return job
 
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating embeddings: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching embedding job: {str(e)}")
 
 
 @router.get("/embedding/status", response_model=List[VectorStoreInfo])
@@ -467,11 +742,55 @@ class MultiQueryResponse(BaseModel):
     results: List[MultiQueryResult]
 
 
+# /search/vectorstores listing, rebuilt only when the Vector_Store/ directory changes
+vector_store_list_cache = {"mtime": None, "data": []}
+
+# Recent /search/query results, reused for repeated or near-identical queries.
+# Entries are (normalized query vector, vector_store_id, store version, top_k, results).
+QUERY_CACHE_SIZE = 256
+QUERY_CACHE_SIMILARITY_THRESHOLD = 0.97
+query_cache = deque(maxlen=QUERY_CACHE_SIZE)
+
+
+def lookup_query_cache(query_vector: np.ndarray, vector_store_id: str, version: int, top_k: int) -> Optional[List[SearchResult]]:
+    """Return cached results for a query whose embedding is within the similarity threshold."""
+    candidates = [entry for entry in query_cache if entry[1:4] == (vector_store_id, version, top_k)]
+    if not candidates:
+        return None
+
+    # Cached vectors are normalized, so the dot products are cosine similarities
+    similarities = np.stack([entry[0] for entry in candidates]) @ query_vector
+    best = int(np.argmax(similarities))
+    if similarities[best] >= QUERY_CACHE_SIMILARITY_THRESHOLD:
+        return candidates[best][4]
+
+    return None
+
+
+# Vector store directories only keep the model's short name
+SENTENCE_TRANSFORMERS_PREFIX = "sentence-transformers/"
+
+
+def parse_vector_store_id(vector_store_id: str) -> Tuple[str, str]:
+    """
+    Split a vector_store_id of the form "VECTORDB_model-name" into the
+    vector database and the full embedding model name.
+    """
+    vector_db, separator, model_short_name = vector_store_id.partition('_')
+    if not separator:
+        raise HTTPException(status_code=400, detail="Invalid vector_store_id format")
+
+    return vector_db, SENTENCE_TRANSFORMERS_PREFIX + model_short_name
+
+
 @router.get("/search/vectorstores", response_model=List[VectorStoreListItem])
 async def get_available_vectorstores():
     """
     Get list of available vector stores by scanning Vector_Store/ directory.
 
+    The scan is cached until the directory's modification time changes,
+    i.e. until a vector store directory is added or removed.
+
     Returns:
         List of VectorStoreListItem with id, vector_db, and embedding_model
     """
@@ -480,39 +799,50 @@ async def get_available_vectorstores():
 
         vector_stores = []
 
-        if not VECTOR_STORE_DIR.exists():
+        try:
+            mtime = VECTOR_STORE_DIR.stat().st_mtime_ns
+        except FileNotFoundError:
             return vector_stores
 
+        if mtime == vector_store_list_cache["mtime"]:
+            return vector_store_list_cache["data"]
+
         # Scan all subdirectories in Vector_Store/
-        for store_dir in VECTOR_STORE_DIR.iterdir():
-            if store_dir.is_dir() and store_dir.name != '__pycache__':
-                # Parse directory name format: "VECTORDB_model-name"
-                # e.g., "FAISS_all-MiniLM-L6-v2" or "Chroma_all-mpnet-base-v2"
-                parts = store_dir.name.split('_', 1)
-                if len(parts) == 2:
-                    vector_db = parts[0]
-                    model_short_name = parts[1]
-
-                    # Reconstruct full model name (assuming sentence-transformers prefix)
-                    full_model_name = f"sentence-transformers/{model_short_name}"
-
-                    vector_stores.append(VectorStoreListItem(
-                        id=store_dir.name,
-                        vector_db=vector_db,
-                        embedding_model=full_model_name,
-                        display_name=f"{vector_db} - {model_short_name}"
-                    ))
+        with os.scandir(VECTOR_STORE_DIR) as entries:
+            for entry in entries:
+                if entry.is_dir() and entry.name != '__pycache__':
+                    # Parse directory name format: "VECTORDB_model-name"
+                    # e.g., "FAISS_all-MiniLM-L6-v2" or "Chroma_all-mpnet-base-v2"
+                    parts = entry.name.split('_', 1)
+                    if len(parts) == 2:
+                        vector_db = parts[0]
+                        model_short_name = parts[1]
+
+                        # Reconstruct full model name (assuming sentence-transformers prefix)
+                        full_model_name = SENTENCE_TRANSFORMERS_PREFIX + model_short_name
+
+                        vector_stores.append(VectorStoreListItem(
+                            id=entry.name,
+                            vector_db=vector_db,
+                            embedding_model=full_model_name,
+                            display_name=f"{vector_db} - {model_short_name}"
+                        ))
 
         # Sort by vector_db then model name for consistent ordering
         vector_stores.sort(key=lambda x: (x.vector_db, x.embedding_model))
 
+        vector_store_list_cache["mtime"] = mtime
+        vector_store_list_cache["data"] = vector_stores
+
         return vector_stores
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing vector stores: {str(e)}")
 
 
-@router.post("/search/query", response_model=SearchQueryResponse)
+# Responses are built from already-typed models, so they are serialized directly instead of
+# being re-validated through response_model; `responses` keeps the schema in the OpenAPI docs.
+@router.post("/search/query", response_model=None, responses={200: {"model": SearchQueryResponse}})
 async def search_query(request: SearchQueryRequest):
     """
     Perform semantic search on a specific vector store.
@@ -524,7 +854,7 @@ async def search_query(request: SearchQueryRequest):
         SearchQueryResponse with ranked results and metadata
     """
     try:
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
 
         # Validate inputs
         if not request.query or not request.query.strip():
@@ -534,17 +864,10 @@ async def search_query(request: SearchQueryRequest):
             raise HTTPException(status_code=400, detail="top_k must be between 1 and 100")
 
         # Parse vector_store_id to extract vector_db and model_name
-        # Format: "VECTORDB_model-name"
-        parts = request.vector_store_id.split('_', 1)
-        if len(parts) != 2:
-            raise HTTPException(status_code=400, detail="Invalid vector_store_id format")
-
-        vector_db = parts[0]
-        model_short_name = parts[1]
-        model_name = f"sentence-transformers/{model_short_name}"
+        vector_db, model_name = parse_vector_store_id(request.vector_store_id)
 
         # Load the vector store
-        vectorstore = embedding_utils.load_vector_store(vector_db, model_name)
+        vectorstore = embedding_utils.get_cached_vector_store(vector_db, model_name)
 
         if vectorstore is None:
             raise HTTPException(
@@ -552,39 +875,47 @@ async def search_query(request: SearchQueryRequest):
                 detail=f"Vector store '{request.vector_store_id}' not found or failed to load"
             )
 
-        # Perform similarity search with scores
-        docs_with_scores = vectorstore.similarity_search_with_score(
-            request.query,
-            k=request.top_k
-        )
+        # Embed the query and reuse cached results for a near-identical earlier query
+        query_vector = np.asarray(vectorstore.embeddings.embed_query(request.query), dtype=np.float32)
+        query_vector /= np.linalg.norm(query_vector) or 1.0
+        version = embedding_utils.get_vector_store_version(vector_db, model_name)
+
+        results = lookup_query_cache(query_vector, request.vector_store_id, version, request.top_k)
+
+        if results is None:
+            # Perform similarity search with scores
+            docs_with_scores = embedding_utils.similarity_search_by_vectors(
+                vectorstore,
+                query_vector[np.newaxis, :],
+                k=request.top_k
+            )[0]
 
-        # Process results
-        results = []
-        for rank, (doc, score) in enumerate(docs_with_scores, start=1):
-            # Convert distance to similarity score (normalized to 0-1, where 1 = most similar)
-            # For FAISS/Chroma with L2 distance, lower scores are better
-            # We'll normalize by converting: similarity = 1 / (1 + distance)
-            similarity_score = 1.0 / (1.0 + score)
+            # Convert distances to similarity scores (normalized to 0-1, where 1 = most similar)
+            similarity_scores = to_similarity_scores(docs_with_scores, vectorstore)
 
-            # Get source file from metadata
-            source_file = doc.metadata.get('source', 'Unknown')
+            # Process results (fields are produced here, so model validation is skipped)
+            results = [
+                SearchResult.model_construct(
+                    rank=rank,
+                    content=doc.page_content,
+                    source_file=doc.metadata.get('source', 'Unknown'),
+                    similarity_score=similarity_score
+                )
+                for rank, ((doc, _), similarity_score) in enumerate(zip(docs_with_scores, similarity_scores), start=1)
+            ]
 
-            results.append(SearchResult(
-                rank=rank,
-                content=doc.page_content,
-                source_file=source_file,
-                similarity_score=round(similarity_score, 4)
-            ))
+            query_cache.append((query_vector, request.vector_store_id, version, request.top_k, results))
 
-        time_taken = time.time() - start_time
+        time_taken = (time.perf_counter_ns() - start_time) / 1e9
 
-        return SearchQueryResponse(
+        response = SearchQueryResponse.model_construct(
             query=request.query,
             total_results=len(results),
             vector_store_used=request.vector_store_id,
             time_taken_seconds=round(time_taken, 3),
             results=results
         )
+        return ORJSONResponse(content=response.model_dump())
 
     except HTTPException:
         raise
@@ -592,7 +923,7 @@ async def search_query(request: SearchQueryRequest):
         raise HTTPException(status_code=500, detail=f"Error performing search: {str(e)}")
 
 
-@router.post("/search/multi-query", response_model=MultiQueryResponse)
+@router.post("/search/multi-query", response_model=None, responses={200: {"model": MultiQueryResponse}})
 async def multi_query_search(request: MultiQueryRequest):
     """
     Perform multiple semantic search queries against the same vector store.
@@ -605,7 +936,7 @@ async def multi_query_search(request: MultiQueryRequest):
         MultiQueryResponse with results grouped by query
     """
     try:
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
 
         # Validate inputs
         if not request.queries or len(request.queries) == 0:
@@ -615,16 +946,10 @@ async def multi_query_search(request: MultiQueryRequest):
             raise HTTPException(status_code=400, detail="top_k must be between 1 and 100")
 
         # Parse vector_store_id
-        parts = request.vector_store_id.split('_', 1)
-        if len(parts) != 2:
-            raise HTTPException(status_code=400, detail="Invalid vector_store_id format")
-
-        vector_db = parts[0]
-        model_short_name = parts[1]
-        model_name = f"sentence-transformers/{model_short_name}"
+        vector_db, model_name = parse_vector_store_id(request.vector_store_id)
 
         # Load the vector store once for all queries
-        vectorstore = embedding_utils.load_vector_store(vector_db, model_name)
+        vectorstore = embedding_utils.get_cached_vector_store(vector_db, model_name)
 
         if vectorstore is None:
             raise HTTPException(
@@ -632,44 +957,47 @@ async def multi_query_search(request: MultiQueryRequest):
                 detail=f"Vector store '{request.vector_store_id}' not found or failed to load"
             )
 
-        # Process each query
-        all_results = []
-        for query in request.queries:
-            if not query or not query.strip():
-                continue
-
-            # Perform similarity search
-            docs_with_scores = vectorstore.similarity_search_with_score(
-                query,
-                k=request.top_k
-            )
-
-            # Process results for this query
-            query_results = []
-            for rank, (doc, score) in enumerate(docs_with_scores, start=1):
-                similarity_score = 1.0 / (1.0 + score)
-                source_file = doc.metadata.get('source', 'Unknown')
-
-                query_results.append(SearchResult(
+        # Embed and search each distinct non-empty query once, in a single batch
+        valid_queries = [query for query in request.queries if query and query.strip()]
+        unique_queries = list(dict.fromkeys(query.strip() for query in valid_queries))
+        results_per_query = embedding_utils.batch_similarity_search(
+            vectorstore,
+            unique_queries,
+            k=request.top_k
+        ) if unique_queries else []
+
+        # Process each distinct query (fields are produced here, so model validation is skipped)
+        results_by_query = {}
+        for query, docs_with_scores in zip(unique_queries, results_per_query):
+            similarity_scores = to_similarity_scores(docs_with_scores, vectorstore)
+            results_by_query[query] = [
+                SearchResult.model_construct(
                     rank=rank,
                     content=doc.page_content,
-                    source_file=source_file,
-                    similarity_score=round(similarity_score, 4)
-                ))
-
-            all_results.append(MultiQueryResult(
+                    source_file=doc.metadata.get('source', 'Unknown'),
+                    similarity_score=similarity_score
+                )
+                for rank, ((doc, _), similarity_score) in enumerate(zip(docs_with_scores, similarity_scores), start=1)
+            ]
+
+        # Expand back to the requested queries, keeping their order and duplicates
+        all_results = [
+            MultiQueryResult.model_construct(
                 query=query,
-                results=query_results
-            ))
+                results=results_by_query[query.strip()]
+            )
+            for query in valid_queries
+        ]
 
-        time_taken = time.time() - start_time
+        time_taken = (time.perf_counter_ns() - start_time) / 1e9
 
-        return MultiQueryResponse(
+        response = MultiQueryResponse.model_construct(
             vector_store_used=request.vector_store_id,
             total_queries=len(all_results),
             time_taken_seconds=round(time_taken, 3),
             results=all_results
         )
+        return ORJSONResponse(content=response.model_dump())
 
     except HTTPException:
         raise
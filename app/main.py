@@ -1,15 +1,32 @@
 """
 FastAPI main application entry point for Semantic Search Engine.
 """
+import os
+import sys
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.gui import router as api_router
+from app.embedding_utils import configure_worker_threads
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Size this worker's compute thread pools at startup, however the server was launched.
+    """
+    configure_worker_threads()
+    yield
+
 
 # Create FastAPI application
 app = FastAPI(
     title="Semantic Search Engine",
     description="AI Research Assistant - University Project",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS middleware
@@ -37,4 +54,21 @@ app.include_router(api_router, prefix="/api")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+
+    # Concurrent searches run in separate processes instead of queueing on one event loop.
+    # WEB_CONCURRENCY is uvicorn's own worker count variable, so an explicit setting wins, and
+    # workers inherit it to size their thread pools (see configure_worker_threads).
+    workers = int(os.environ.setdefault("WEB_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        # Multiple workers can't be combined with reload; use `uvicorn app.main:app --reload` for development.
+        workers=workers,
+        # Keep idle connections open between the GUI's requests, e.g. while polling embedding jobs
+        timeout_keep_alive=30,
+        # uvloop is not available on Windows
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools"
+    )
@@ -11,6 +11,18 @@ interface EmbeddingResult {
   time_taken_seconds: number;
 }
 
+interface EmbeddingJob {
+  job_id: string;
+  status: 'running' | 'completed' | 'failed';
+  started_at: number;
+  updated_at: number;
+  result: EmbeddingResult | null;
+  error: string | null;
+}
+
+// Give up polling an embedding job after this long
+const EMBEDDING_JOB_TIMEOUT_MS = 60 * 60 * 1000;
+
 interface VectorStoreInfo {
   store_name: string;
   vector_db: string;
@@ -77,6 +89,23 @@ export default function EmbeddingPage() {
     }
   };
 
+  const waitForEmbeddingJob = async (jobId: string): Promise<EmbeddingResult> => {
+    // Embedding generation runs in the background, poll until it finishes or the deadline passes
+    const deadline = Date.now() + EMBEDDING_JOB_TIMEOUT_MS;
+    while (Date.now() < deadline) {
+      await new Promise(resolve => setTimeout(resolve, 1000));
+
+      const response = await fetch(`http://localhost:8000/api/embedding/jobs/${jobId}`);
+      if (!response.ok) throw new Error('Failed to fetch embedding job status');
+
+      const job: EmbeddingJob = await response.json();
+      if (job.status === 'completed' && job.result) return job.result;
+      if (job.status === 'failed') throw new Error(job.error || 'Failed to generate embeddings');
+    }
+
+    throw new Error('Timed out waiting for embedding generation to finish');
+  };
+
   const handleGenerateEmbeddings = async () => {
     if (!selectedModel || !selectedVectorDB) {
       setError('Please select both an embedding model and vector database');
@@ -104,7 +133,8 @@ export default function EmbeddingPage() {
         throw new Error(errorData.detail || 'Failed to generate embeddings');
       }
 
-      const data = await response.json();
+      const job: EmbeddingJob = await response.json();
+      const data = await waitForEmbeddingJob(job.job_id);
       setResult(data);
 
       // Refresh existing stores list
@@ -121,6 +121,7 @@ export interface DocumentContent {
   content: string;
   size_bytes: number;
   size_readable: string;
+  truncated: boolean;
 }
 
 /**